@@ -11,6 +11,9 @@ import pandas as pd
 import numpy as np
 import io
 import os
+import hashlib
+from sqlalchemy import text, func
+from sqlalchemy.orm import selectinload, sessionmaker
 import json
 from modules.data_processor import process_tems_data, detect_file_format
 from modules.analyzer import (
@@ -37,20 +40,367 @@ from modules.visualizer import (
 )
 from modules.database import (
     init_db, 
-    save_drive_test, 
-    save_analysis_report, 
-    save_problem_areas,
-    get_all_drive_tests,
-    get_drive_test_by_id,
-    get_reports_for_drive_test,
-    get_problem_areas_for_drive_test,
-    delete_drive_test
+    DriveTest,
+    TestMetrics,
+    AnalysisReport,
+    ProblemArea
 )
+from modules.storage import (
+    DriveTestInfo,
+    SaveJob,
+    configure_sessions,
+    delete_drive_test,
+    enqueue_save,
+    get_save_status,
+    session_scope
+)
+
+def _as_upload(file_bytes, name):
+    """Wrap raw upload bytes in a named file-like object for the data processor"""
+    buffer = io.BytesIO(file_bytes)
+    buffer.name = name
+    return buffer
+
+# Parsing is keyed on a digest of the upload so widget reruns reuse the result
+# without Streamlit re-hashing the raw bytes for every cached call
+@st.cache_data(show_spinner=False)
+def _detect_format(_file_bytes, df_key, name):
+    return detect_file_format(_as_upload(_file_bytes, name))
+
+# Telemetry columns stored as float32; dB/kbps resolution does not need float64
+# and halving the width halves the bandwidth of every analysis pass
+FLOAT32_COLUMNS = ('RSRP', 'RSRQ', 'SINR', 'Throughput_DL', 'Throughput_UL')
+
+@st.cache_data(show_spinner=False)
+def _load_df(_file_bytes, df_key, name):
+    df = process_tems_data(_as_upload(_file_bytes, name))
+    for column in FLOAT32_COLUMNS:
+        if column in df.columns and pd.api.types.is_float_dtype(df[column]):
+            df[column] = df[column].astype(np.float32)
+    # Pure-text object columns (events, cell names) move to Arrow-backed strings,
+    # which are more compact and faster to filter than Python str objects.
+    # Columns with gaps stay object: comparing <NA> yields <NA> rather than the
+    # True that NaN != 'Active' gives, which would change the analyzer masks
+    for column in df.columns[df.dtypes == object]:
+        if df[column].notna().all() and pd.api.types.infer_dtype(df[column], skipna=False) == 'string':
+            df[column] = df[column].astype(pd.StringDtype("pyarrow"))
+    return df
+
+# Analysis results are cached per upload digest and thresholds; the leading
+# underscore keeps Streamlit from hashing the DataFrame itself on every call
+@st.cache_data(show_spinner=False)
+def _rf_metrics(_df, df_key, rsrp_threshold, rsrq_threshold, sinr_threshold):
+    return analyze_rf_metrics(_df, rsrp_threshold, rsrq_threshold, sinr_threshold)
+
+@st.cache_data(show_spinner=False)
+def _coverage(_df, df_key, rsrp_threshold, rsrq_threshold):
+    return analyze_coverage_problems(_df, rsrp_threshold, rsrq_threshold)
+
+@st.cache_data(show_spinner=False)
+def _interference(_df, df_key, sinr_threshold):
+    return analyze_interference(_df, sinr_threshold)
+
+@st.cache_data(show_spinner=False)
+def _handover(_df, df_key):
+    return analyze_handover_failures(_df)
+
+@st.cache_data(show_spinner=False)
+def _throughput(_df, df_key):
+    return analyze_throughput_bottlenecks(_df)
+
+@st.cache_data(show_spinner=False)
+def _call_drops(_df, df_key):
+    return analyze_call_drops(_df)
+
+# Above this many samples the map is binned to a ~11 m grid before plotting
+MAP_MAX_POINTS = 20000
+
+@st.cache_data(show_spinner=False)
+def _map_points(_df, df_key):
+    """
+    Decimate a large drive test for the map view
+    
+    Keeps one sample per grid cell (lat/lon rounded to 4 decimals) carrying the
+    cell's mean RSRP/RSRQ/SINR, plus every event row so the cell change,
+    handover and drop markers are still drawn.
+    """
+    points = _df.reset_index(drop=True)
+    grouped = points.groupby(
+        [points['Latitude'].round(4).rename('Lat_Bin'), points['Longitude'].round(4).rename('Lon_Bin')],
+        sort=False
+    )
+    representatives = grouped.head(1).index
+    
+    events = pd.Series(False, index=points.index)
+    for column in ('Cell_Change', 'Handover_Event'):
+        if column in points.columns:
+            events |= points[column] == True
+    if 'Event' in points.columns:
+        events |= points['Event'].astype(str).str.contains('drop|fail', case=False, na=False)
+    
+    map_df = points.loc[representatives.union(points.index[events])].copy()
+    rf_columns = [column for column in ('RSRP', 'RSRQ', 'SINR') if column in points.columns]
+    if rf_columns:
+        # Integer dBm exports must hold the float bin means
+        for column in rf_columns:
+            if not pd.api.types.is_float_dtype(map_df[column]):
+                map_df[column] = map_df[column].astype(float)
+        map_df.loc[representatives, rf_columns] = grouped[rf_columns].transform('mean').loc[representatives]
+    return map_df
+
+# Summary Report root-cause rules, checked in order for the selected analysis types:
+# (analysis type, issue, results source, trigger, severity, description, recommendation)
+ROOT_CAUSE_RULES = [
+    (
+        "Coverage Problems", "Coverage Problems",
+        lambda df, df_key, thresholds: _coverage(df, df_key, thresholds[0], thresholds[1]),
+        lambda r: r['coverage_issues_pct'] > 10,
+        lambda r: "High" if r['coverage_issues_pct'] > 25 else "Medium",
+        lambda r: f"Poor signal coverage affecting {r['coverage_issues_pct']:.1f}% of the drive test area",
+        "Review cell site placement and antenna configurations. Consider adding new sites in critical areas."
+    ),
+    (
+        "Interference", "Interference Issues",
+        lambda df, df_key, thresholds: _interference(df, df_key, thresholds[2]),
+        lambda r: r['interference_issues_pct'] > 10,
+        lambda r: "High" if r['interference_issues_pct'] > 25 else "Medium",
+        lambda r: f"High interference affecting {r['interference_issues_pct']:.1f}% of the drive test area",
+        "Review PCI planning, adjust antenna tilts, and optimize frequency planning to reduce interference."
+    ),
+    (
+        "Handover Failures", "Handover Failures",
+        lambda df, df_key, thresholds: _handover(df, df_key),
+        lambda r: r['handover_success_rate'] < 95,
+        lambda r: "High" if r['handover_success_rate'] < 90 else "Medium",
+        lambda r: f"Handover failures with success rate of {r['handover_success_rate']:.2f}%",
+        "Review neighbor cell lists, optimize handover parameters, and check for missing neighbors."
+    ),
+    (
+        "Throughput Bottlenecks", "Throughput Bottlenecks",
+        lambda df, df_key, thresholds: _throughput(df, df_key),
+        lambda r: r['dl_bottleneck_areas'] > 5 or r['ul_bottleneck_areas'] > 5,
+        lambda r: "Medium",
+        lambda r: f"Low throughput areas identified: {r['dl_bottleneck_areas']} DL and {r['ul_bottleneck_areas']} UL locations",
+        "Check resource allocation, scheduling algorithms, and consider capacity expansions in affected cells."
+    ),
+    (
+        "Call Drops", "Call Drops",
+        lambda df, df_key, thresholds: _call_drops(df, df_key),
+        lambda r: r['call_drop_rate'] > 2,
+        lambda r: "High" if r['call_drop_rate'] > 5 else "Medium",
+        lambda r: f"Call drop rate of {r['call_drop_rate']:.2f}%",
+        "Review RRC configuration, mobility parameters, and cell coverage overlaps to reduce drops."
+    )
+]
+
+@st.cache_data(show_spinner=False)
+def _summary_root_causes(_df, df_key, analysis_types, rsrp_threshold, rsrq_threshold, sinr_threshold):
+    """Assemble the Summary Report root causes for the selected analysis types"""
+    atypes = frozenset(analysis_types)
+    thresholds = (rsrp_threshold, rsrq_threshold, sinr_threshold)
+    root_causes = []
+    
+    for analysis_type, issue, source, triggered, severity, describe, recommendation in ROOT_CAUSE_RULES:
+        if analysis_type not in atypes:
+            continue
+        results = source(_df, df_key, thresholds)
+        if triggered(results):
+            root_causes.append({
+                "Issue": issue,
+                "Severity": severity(results),
+                "Description": describe(results),
+                "Recommendation": recommendation
+            })
+    
+    return root_causes
+
+def _csv_bytes(rows):
+    """Write rows as CSV straight into a byte buffer, without an intermediate str"""
+    buffer = io.BytesIO()
+    pd.DataFrame(rows).to_csv(buffer, index=False, chunksize=10_000)
+    return buffer.getvalue()
+
+@st.cache_data(show_spinner=False)
+def _build_report_bytes(_df, df_key, analysis_types, rsrp_threshold, rsrq_threshold, sinr_threshold):
+    """Serialize the Summary Report root causes to CSV for download"""
+    root_causes = _summary_root_causes(_df, df_key, analysis_types, rsrp_threshold, rsrq_threshold, sinr_threshold)
+    if not root_causes:
+        return b"No significant issues detected"
+    return _csv_bytes(root_causes)
+
+# Database reads are cached briefly so reruns skip the round-trips
+def _format_datetimes(values):
+    """Format datetimes as 'YYYY-MM-DD HH:MM' labels in one call, with 'N/A' for missing values"""
+    return pd.to_datetime(pd.Series(values, dtype=object)).dt.strftime("%Y-%m-%d %H:%M").fillna("N/A")
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _list_drive_tests():
+    """Fetch the saved drive test listing as plain tuples, newest first"""
+    with session_scope() as session:
+        return [tuple(row) for row in session.query(
+            DriveTest.id, DriveTest.filename, DriveTest.file_format, DriveTest.upload_date,
+            DriveTest.record_count, DriveTest.start_time, DriveTest.end_time
+        ).order_by(DriveTest.upload_date.desc())]
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _get_drive_test_full(drive_test_id):
+    """
+    Fetch a drive test with its metrics, report headers and problem areas
+    
+    Everything is read as plain column values, so nothing in the result is
+    bound to the session once it closes. Report thresholds, results and root
+    causes are left to _load_report_detail.
+    
+    Returns:
+        tuple: (DriveTestInfo or None, metrics dict or None, (report ID, analysis
+        type, date label) tuples newest first, (problem type, area count) tuples)
+    """
+    with session_scope() as session:
+        row = session.query(
+            DriveTest.id, DriveTest.filename, DriveTest.file_format, DriveTest.upload_date,
+            DriveTest.record_count, DriveTest.start_time, DriveTest.end_time
+        ).filter(DriveTest.id == drive_test_id).first()
+        
+        if row is None:
+            return None, None, [], []
+        drive_test = DriveTestInfo(*row)
+        
+        # The averages are aggregated once at save time, so reading them is a
+        # single indexed lookup of the columns the view shows
+        metrics_row = session.query(
+            TestMetrics.avg_rsrp, TestMetrics.avg_rsrq, TestMetrics.avg_sinr, TestMetrics.avg_throughput_dl
+        ).filter(TestMetrics.drive_test_id == drive_test_id).first()
+        metrics = metrics_row._asdict() if metrics_row is not None else None
+        
+        report_rows = session.query(
+            AnalysisReport.id, AnalysisReport.analysis_type, AnalysisReport.report_date
+        ).filter(
+            AnalysisReport.drive_test_id == drive_test_id
+        ).order_by(AnalysisReport.report_date.desc()).all()
+        # Format the report dates in one vectorized call
+        report_dates = _format_datetimes([row.report_date for row in report_rows])
+        reports = [
+            (row.id, row.analysis_type, report_date)
+            for row, report_date in zip(report_rows, report_dates)
+        ]
+        
+        # Only the per-type counts are needed up front; the rows themselves are
+        # fetched by _load_problem_areas when the user opens a group
+        problem_area_counts = [tuple(row) for row in session.query(
+            ProblemArea.problem_type, func.count(ProblemArea.id)
+        ).filter(
+            ProblemArea.drive_test_id == drive_test_id
+        ).group_by(ProblemArea.problem_type).order_by(ProblemArea.problem_type)]
+        return drive_test, metrics, reports, problem_area_counts
+
+PROBLEM_AREAS_PAGE_SIZE = 500
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _load_problem_areas(drive_test_id, problem_type, page):
+    """
+    Fetch one page of a drive test's problem areas of a given type
+    
+    Returns:
+        DataFrame of problem areas, at most PROBLEM_AREAS_PAGE_SIZE rows
+    """
+    with session_scope() as session:
+        rows = session.query(
+            ProblemArea.id, ProblemArea.latitude, ProblemArea.longitude,
+            ProblemArea.avg_rsrp, ProblemArea.avg_rsrq, ProblemArea.avg_sinr,
+            ProblemArea.cell_id, ProblemArea.description
+        ).filter(
+            ProblemArea.drive_test_id == drive_test_id,
+            ProblemArea.problem_type == problem_type
+        ).order_by(ProblemArea.id).limit(PROBLEM_AREAS_PAGE_SIZE).offset(page * PROBLEM_AREAS_PAGE_SIZE).all()
+        return pd.DataFrame.from_records(
+            rows,
+            columns=["ID", "Latitude", "Longitude", "RSRP (dBm)", "RSRQ (dB)",
+                     "SINR (dB)", "Cell ID", "Description"]
+        )
+
+@st.cache_resource(max_entries=256, show_spinner=False)
+def _parse_report_json(report_id, kind, _blob):
+    """
+    Parse a stored report JSON column once per report
+    
+    Reports are never updated in place, so the parse is keyed on the report
+    ID and column alone and outlives the _load_report_detail TTL. The parsed
+    dict is shared rather than copied on each hit, so callers must not
+    mutate it.
+    """
+    return json.loads(_blob) if _blob else {}
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _load_report_detail(report_id):
+    """
+    Fetch and decode one report's thresholds, results and root causes
+    
+    Returns:
+        tuple: (thresholds dict, top-level scalar results dict,
+        (issue type, severity, description, recommendation) tuples)
+    """
+    with session_scope() as session:
+        report = session.query(AnalysisReport).options(
+            selectinload(AnalysisReport.root_causes)
+        ).filter(AnalysisReport.id == report_id).first()
+        
+        if report is None:
+            return {}, {}, []
+        
+        thresholds = _parse_report_json(report.id, "thresholds", report.threshold_values)
+        # Only the top-level scalars are displayed, so only those are kept in the cache
+        results = _parse_report_json(report.id, "results", report.results)
+        results = {key: value for key, value in results.items() if not isinstance(value, (dict, list))}
+        root_causes = [
+            (rc.issue_type, rc.severity, rc.description, rc.recommendation)
+            for rc in report.root_causes
+        ]
+        return thresholds, results, root_causes
+
+def _clear_drive_test_cache():
+    """Drop cached drive test lookups after the database changes"""
+    _list_drive_tests.clear()
+    _get_drive_test_full.clear()
+    _load_problem_areas.clear()
+    _parse_report_json.clear()
+    _load_report_detail.clear()
+
+# Indexes backing the per drive test lookups in the Database tab
+DB_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_metrics_dt ON test_metrics (drive_test_id)",
+    "CREATE INDEX IF NOT EXISTS idx_reports_dt ON analysis_reports (drive_test_id)",
+    "CREATE INDEX IF NOT EXISTS idx_root_causes_report ON root_causes (report_id)",
+    "CREATE INDEX IF NOT EXISTS idx_pa_dt_type ON problem_areas (drive_test_id, problem_type)"
+]
+
+ANALYZE_TABLES = ("drive_tests", "test_metrics", "analysis_reports", "root_causes", "problem_areas")
+
+def _ensure_indexes(engine):
+    """Create the indexes used to look up data by drive test"""
+    with engine.begin() as conn:
+        for statement in DB_INDEXES:
+            conn.execute(text(statement))
+
+@st.cache_resource(show_spinner=False)
+def _init_database():
+    """Set up tables, indexes and planner statistics once per server process"""
+    engine = init_db()
+    _ensure_indexes(engine)
+    # Refresh planner statistics on PostgreSQL; one table per statement works
+    # on every server version, and other backends skip it
+    if engine.dialect.name == 'postgresql':
+        with engine.begin() as conn:
+            for table in ANALYZE_TABLES:
+                conn.execute(text(f"ANALYZE {table}"))
+    # Reads, background saves and deletes all check connections out of this
+    # engine's pool instead of building an engine per session
+    configure_sessions(sessionmaker(bind=engine))
+    return engine
 
 # Initialize the database
 database_available = False
 try:
-    init_db()
+    engine = _init_database()
     database_available = True
     st.sidebar.success("✅ Database connected successfully!")
 except Exception as e:
@@ -77,7 +427,10 @@ with st.sidebar:
                                     help="Upload TEMS drive test log files for analysis.")
     
     if uploaded_file is not None:
-        file_format = detect_file_format(uploaded_file)
+        file_bytes = uploaded_file.getvalue()
+        # The parser is chosen by file extension, so the name is part of the key
+        df_key = hashlib.md5(uploaded_file.name.encode() + b"\0" + file_bytes).hexdigest()
+        file_format = _detect_format(file_bytes, df_key, uploaded_file.name)
         if file_format == 'TEMS TRP':
             st.warning("""
             ⚠️ TRP file format detected. 
@@ -92,32 +445,254 @@ with st.sidebar:
     
     st.header("Analysis Settings")
     
-    analysis_types = st.multiselect(
-        "Select Analysis Types",
-        [
-            "Coverage Problems",
-            "Interference",
-            "Handover Failures",
-            "Throughput Bottlenecks",
-            "Call Drops",
-            "Cell Overloading",
-            "Parameter Mismatches",
-            "QoS Issues",
-            "RF Metrics (RSRP, RSRQ, SINR)",
-            "Idle/Connected Mode Failures"
-        ],
-        default=["Coverage Problems", "RF Metrics (RSRP, RSRQ, SINR)"]
-    )
+    # Widgets inside a form only rerun the app when the settings are applied,
+    # not on every slider tick
+    with st.form("analysis_settings"):
+        analysis_types = st.multiselect(
+            "Select Analysis Types",
+            [
+                "Coverage Problems",
+                "Interference",
+                "Handover Failures",
+                "Throughput Bottlenecks",
+                "Call Drops",
+                "Cell Overloading",
+                "Parameter Mismatches",
+                "QoS Issues",
+                "RF Metrics (RSRP, RSRQ, SINR)",
+                "Idle/Connected Mode Failures"
+            ],
+            default=["Coverage Problems", "RF Metrics (RSRP, RSRQ, SINR)"]
+        )
+        atypes = frozenset(analysis_types)
     
-    # Thresholds for analysis
-    st.subheader("Analysis Thresholds")
-    rsrp_threshold = st.slider("RSRP Threshold (dBm)", -140, -70, -105)
-    rsrq_threshold = st.slider("RSRQ Threshold (dB)", -20, 0, -15)
-    sinr_threshold = st.slider("SINR Threshold (dB)", -10, 30, 5)
+        # Thresholds for analysis
+        st.subheader("Analysis Thresholds")
+        rsrp_threshold = st.slider("RSRP Threshold (dBm)", -140, -70, -105)
+        rsrq_threshold = st.slider("RSRQ Threshold (dB)", -20, 0, -15)
+        sinr_threshold = st.slider("SINR Threshold (dB)", -10, 30, 5)
+        
+        st.form_submit_button("Apply Settings")
     
     # Generate report button
     generate_report = st.button("Generate Analysis Report")
 
+def _has_results(results):
+    """True if an analysis produced anything besides None, zeros and empty containers"""
+    for value in results.values():
+        if isinstance(value, pd.DataFrame):
+            if not value.empty:
+                return True
+        elif isinstance(value, dict):
+            if _has_results(value):
+                return True
+        elif isinstance(value, (int, float, np.number)):
+            if value:
+                return True
+        elif value is not None and (not hasattr(value, '__len__') or len(value) > 0):
+            return True
+    return False
+
+def _value_table(values):
+    """Key/value pairs as a one-column table, so they render as a single element"""
+    return pd.Series(values, dtype=object).astype(str).to_frame("Value")
+
+def _has_pending_saves():
+    """True if any save queued in this session is still waiting on the storage worker"""
+    return any(
+        get_save_status(job_id)[0] == "queued"
+        for job_id, _ in st.session_state.get("save_jobs", [])
+    )
+
+def _report_save_jobs(prune=True):
+    """
+    Show the outcome of the saves queued in this session
+    
+    Args:
+        prune: Forget saves once their final state has been shown, so each
+            success or error is reported on one page render only
+    
+    Returns:
+        bool: True if any save is still queued
+    """
+    pending = False
+    remaining = []
+    for job_id, filename in st.session_state.get("save_jobs", []):
+        state, detail = get_save_status(job_id)
+        if state == "saved":
+            # Make a finished save show up in the saved drive test list
+            if job_id not in st.session_state.setdefault("saves_seen", set()):
+                st.session_state["saves_seen"].add(job_id)
+                _clear_drive_test_cache()
+            st.success(f"Drive test '{filename}' saved to database successfully (ID: {detail})!")
+        elif state == "failed":
+            st.error(f"Error saving '{filename}' to database: {detail}")
+        elif state == "queued":
+            pending = True
+            st.info(f"Drive test '{filename}' is queued for saving.")
+        
+        if state == "queued" or not prune:
+            remaining.append((job_id, filename))
+        else:
+            st.session_state.get("saves_seen", set()).discard(job_id)
+    st.session_state["save_jobs"] = remaining
+    return pending
+
+@st.fragment(run_every=1)
+def _poll_save_jobs():
+    """Refresh the save status every second until the queued saves finish"""
+    # Finished saves are kept for the full-page rerun below, which reports and prunes them
+    if not _report_save_jobs(prune=False):
+        # Rerun the whole page so the saved list picks up the new drive tests
+        st.rerun()
+
+def render_saved_drive_tests():
+    """Render the saved drive test list and the details of the selected test"""
+    # List all drive tests in the database
+    st.subheader("Saved Drive Tests")
+
+    # Only hit the database once the user asks for the list
+    if st.button("Refresh list"):
+        st.session_state["db_tab_active"] = True
+        _clear_drive_test_cache()
+
+    if not st.session_state.get("db_tab_active"):
+        st.info("Click 'Refresh list' to load the saved drive tests.")
+        return
+
+    try:
+        drive_tests = _list_drive_tests()
+
+        if not drive_tests:
+            st.info("No drive tests saved in the database yet.")
+        else:
+            # Convert to dataframe for display
+            drive_tests_df = pd.DataFrame.from_records(
+                drive_tests,
+                columns=["ID", "Filename", "Format", "Upload Date", "Records", "Start Time", "End Time"]
+            )
+            for column in ("Upload Date", "Start Time", "End Time"):
+                drive_tests_df[column] = _format_datetimes(drive_tests_df[column])
+
+            # Display as dataframe
+            st.dataframe(drive_tests_df)
+
+            # Select drive test for details
+            id_to_name = dict(zip(drive_tests_df["ID"], drive_tests_df["Filename"]))
+            selected_id = st.selectbox(
+                "Select Drive Test to View Details",
+                options=list(id_to_name),
+                format_func=lambda x: f"ID: {x} - {id_to_name.get(x, 'Unknown')}"
+            )
+
+            if selected_id:
+                # Get the selected drive test details
+                drive_test, metrics, reports, problem_area_counts = _get_drive_test_full(selected_id)
+
+                if drive_test:
+                    st.subheader(f"Drive Test Details: {drive_test.filename}")
+
+                    # Display basic info
+                    detail_col1, detail_col2 = st.columns(2)
+                    with detail_col1:
+                        st.write(f"**ID:** {drive_test.id}")
+                        st.write(f"**Filename:** {drive_test.filename}")
+                        st.write(f"**Format:** {drive_test.file_format}")
+
+                    with detail_col2:
+                        upload_date, start_time, end_time = _format_datetimes(
+                            [drive_test.upload_date, drive_test.start_time, drive_test.end_time]
+                        )
+                        st.write(f"**Upload Date:** {upload_date}")
+                        st.write(f"**Record Count:** {drive_test.record_count}")
+                        st.write(f"**Time Range:** {start_time} to {end_time}")
+
+                    # Show metrics if available
+                    if metrics:
+                        st.subheader("Test Metrics")
+
+                        metric_col1, metric_col2, metric_col3, metric_col4 = st.columns(4)
+                        with metric_col1:
+                            if metrics['avg_rsrp'] is not None:
+                                st.metric("Avg RSRP (dBm)", f"{metrics['avg_rsrp']:.2f}")
+                        with metric_col2:
+                            if metrics['avg_rsrq'] is not None:
+                                st.metric("Avg RSRQ (dB)", f"{metrics['avg_rsrq']:.2f}")
+                        with metric_col3:
+                            if metrics['avg_sinr'] is not None:
+                                st.metric("Avg SINR (dB)", f"{metrics['avg_sinr']:.2f}")
+                        with metric_col4:
+                            if metrics['avg_throughput_dl'] is not None:
+                                st.metric("Avg DL Throughput (Mbps)", f"{metrics['avg_throughput_dl']/1000:.2f}")
+
+                    # Show analysis reports if available
+                    if reports:
+                        st.subheader("Analysis Reports")
+
+                        for report_id, analysis_type, report_date in reports:
+                            with st.expander(f"{analysis_type} - {report_date}"):
+                                st.write(f"**Analysis Type:** {analysis_type}")
+                                st.write(f"**Report Date:** {report_date}")
+
+                                # Expander bodies run even when collapsed, so the report
+                                # contents are only fetched once the user asks for them
+                                if not st.checkbox("Show report details", key=f"report_details_{report_id}"):
+                                    continue
+                                thresholds, results, root_causes = _load_report_detail(report_id)
+
+                                # Display thresholds
+                                if thresholds:
+                                    st.write("**Thresholds:**")
+                                    st.table(_value_table(thresholds))
+
+                                # Display results
+                                if results:
+                                    st.write("**Results:**")
+                                    st.table(_value_table(results))
+
+                                # Display root causes if available
+                                if root_causes:
+                                    st.write("**Root Causes:**")
+                                    st.dataframe(pd.DataFrame.from_records(
+                                        root_causes,
+                                        columns=["Issue", "Severity", "Description", "Recommendation"]
+                                    ))
+
+                    # Show problem areas if available
+                    if problem_area_counts:
+                        st.subheader("Problem Areas")
+
+                        for problem_type, area_count in problem_area_counts:
+                            with st.expander(f"{problem_type} Problems ({area_count} areas)"):
+                                # Rows are only fetched once the user asks for them, a page at a time
+                                if not st.checkbox("Show problem areas", key=f"problem_areas_{drive_test.id}_{problem_type}"):
+                                    continue
+                                page_count = -(-area_count // PROBLEM_AREAS_PAGE_SIZE)
+                                page = 0
+                                if page_count > 1:
+                                    page = st.number_input(
+                                        f"Page (1-{page_count})",
+                                        min_value=1,
+                                        max_value=page_count,
+                                        value=1,
+                                        key=f"problem_areas_page_{drive_test.id}_{problem_type}"
+                                    ) - 1
+                                areas_df = _load_problem_areas(drive_test.id, problem_type, page)
+                                st.dataframe(areas_df, use_container_width=True, hide_index=True)
+
+                    # Option to delete the drive test
+                    if st.button(f"Delete Drive Test ID: {drive_test.id}"):
+                        if delete_drive_test(drive_test.id):
+                            _clear_drive_test_cache()
+                            st.success(f"Drive test '{drive_test.filename}' (ID: {drive_test.id}) deleted successfully!")
+                            st.warning("Click 'Refresh list' to update the list.")
+                        else:
+                            st.error(f"Error deleting drive test ID: {drive_test.id}")
+
+    except Exception as e:
+        st.error(f"Error accessing database: {str(e)}")
+        st.exception(e)
+
 # Main content area
 if uploaded_file is None:
     # Create tabs for home and database
@@ -158,158 +733,17 @@ if uploaded_file is None:
         st.subheader("Drive Test Database")
         st.info("Upload a drive test file first to analyze and save it to the database.")
         
-        # List all drive tests in the database
-        st.subheader("Saved Drive Tests")
-        
-        try:
-            drive_tests = get_all_drive_tests()
-            
-            if not drive_tests:
-                st.info("No drive tests saved in the database yet.")
-            else:
-                # Convert to dataframe for display
-                drive_tests_data = []
-                for dt in drive_tests:
-                    drive_tests_data.append({
-                        "ID": dt.id,
-                        "Filename": dt.filename,
-                        "Format": dt.file_format,
-                        "Upload Date": dt.upload_date.strftime("%Y-%m-%d %H:%M"),
-                        "Records": dt.record_count,
-                        "Start Time": dt.start_time.strftime("%Y-%m-%d %H:%M") if dt.start_time else "N/A",
-                        "End Time": dt.end_time.strftime("%Y-%m-%d %H:%M") if dt.end_time else "N/A"
-                    })
-                
-                # Display as dataframe
-                st.dataframe(pd.DataFrame(drive_tests_data))
-                
-                # Select drive test for details
-                selected_id = st.selectbox(
-                    "Select Drive Test to View Details",
-                    options=[dt["ID"] for dt in drive_tests_data],
-                    format_func=lambda x: f"ID: {x} - {next((dt['Filename'] for dt in drive_tests_data if dt['ID'] == x), 'Unknown')}"
-                )
-                
-                if selected_id:
-                    # Get the selected drive test details
-                    drive_test = get_drive_test_by_id(selected_id)
-                    
-                    if drive_test:
-                        st.subheader(f"Drive Test Details: {drive_test.filename}")
-                        
-                        # Display basic info
-                        detail_col1, detail_col2 = st.columns(2)
-                        with detail_col1:
-                            st.write(f"**ID:** {drive_test.id}")
-                            st.write(f"**Filename:** {drive_test.filename}")
-                            st.write(f"**Format:** {drive_test.file_format}")
-                        
-                        with detail_col2:
-                            st.write(f"**Upload Date:** {drive_test.upload_date.strftime('%Y-%m-%d %H:%M')}")
-                            st.write(f"**Record Count:** {drive_test.record_count}")
-                            st.write(f"**Time Range:** {drive_test.start_time.strftime('%Y-%m-%d %H:%M') if drive_test.start_time else 'N/A'} to {drive_test.end_time.strftime('%Y-%m-%d %H:%M') if drive_test.end_time else 'N/A'}")
-                        
-                        # Show metrics if available
-                        if drive_test.metrics:
-                            st.subheader("Test Metrics")
-                            metrics = drive_test.metrics[0]  # Get the first (should be only) metrics object
-                            
-                            metric_col1, metric_col2, metric_col3, metric_col4 = st.columns(4)
-                            with metric_col1:
-                                if metrics.avg_rsrp is not None:
-                                    st.metric("Avg RSRP (dBm)", f"{metrics.avg_rsrp:.2f}")
-                            with metric_col2:
-                                if metrics.avg_rsrq is not None:
-                                    st.metric("Avg RSRQ (dB)", f"{metrics.avg_rsrq:.2f}")
-                            with metric_col3:
-                                if metrics.avg_sinr is not None:
-                                    st.metric("Avg SINR (dB)", f"{metrics.avg_sinr:.2f}")
-                            with metric_col4:
-                                if metrics.avg_throughput_dl is not None:
-                                    st.metric("Avg DL Throughput (Mbps)", f"{metrics.avg_throughput_dl/1000:.2f}")
-                        
-                        # Show analysis reports if available
-                        reports = get_reports_for_drive_test(drive_test.id)
-                        if reports:
-                            st.subheader("Analysis Reports")
-                            
-                            for report in reports:
-                                with st.expander(f"{report.analysis_type} - {report.report_date.strftime('%Y-%m-%d %H:%M')}"):
-                                    st.write(f"**Analysis Type:** {report.analysis_type}")
-                                    st.write(f"**Report Date:** {report.report_date.strftime('%Y-%m-%d %H:%M')}")
-                                    
-                                    # Display thresholds
-                                    if report.threshold_values:
-                                        st.write("**Thresholds:**")
-                                        thresholds = json.loads(report.threshold_values)
-                                        for key, value in thresholds.items():
-                                            st.write(f"- {key}: {value}")
-                                    
-                                    # Display results
-                                    if report.results:
-                                        st.write("**Results:**")
-                                        results = json.loads(report.results)
-                                        for key, value in results.items():
-                                            if not isinstance(value, dict) and not isinstance(value, list):
-                                                st.write(f"- {key}: {value}")
-                                    
-                                    # Display root causes if available
-                                    if report.root_causes:
-                                        st.write("**Root Causes:**")
-                                        for rc in report.root_causes:
-                                            st.write(f"- **{rc.issue_type}** ({rc.severity}): {rc.description}")
-                                            st.write(f"  Recommendation: {rc.recommendation}")
-                        
-                        # Show problem areas if available
-                        problem_areas = get_problem_areas_for_drive_test(drive_test.id)
-                        if problem_areas:
-                            st.subheader("Problem Areas")
-                            
-                            # Group by problem type
-                            problem_types = {}
-                            for pa in problem_areas:
-                                if pa.problem_type not in problem_types:
-                                    problem_types[pa.problem_type] = []
-                                problem_types[pa.problem_type].append(pa)
-                            
-                            for problem_type, areas in problem_types.items():
-                                with st.expander(f"{problem_type} Problems ({len(areas)} areas)"):
-                                    areas_data = []
-                                    for area in areas:
-                                        areas_data.append({
-                                            "ID": area.id,
-                                            "Latitude": area.latitude,
-                                            "Longitude": area.longitude,
-                                            "RSRP (dBm)": area.avg_rsrp,
-                                            "RSRQ (dB)": area.avg_rsrq,
-                                            "SINR (dB)": area.avg_sinr,
-                                            "Cell ID": area.cell_id,
-                                            "Description": area.description
-                                        })
-                                    st.dataframe(pd.DataFrame(areas_data))
-                        
-                        # Option to delete the drive test
-                        if st.button(f"Delete Drive Test ID: {drive_test.id}"):
-                            if delete_drive_test(drive_test.id):
-                                st.success(f"Drive test '{drive_test.filename}' (ID: {drive_test.id}) deleted successfully!")
-                                st.warning("Refresh the page to update the list.")
-                            else:
-                                st.error(f"Error deleting drive test ID: {drive_test.id}")
-        
-        except Exception as e:
-            st.error(f"Error accessing database: {str(e)}")
-            st.exception(e)
+        render_saved_drive_tests()
 else:
     # Process the uploaded data
     try:
         with st.spinner("Processing drive test data..."):
-            df = process_tems_data(uploaded_file)
+            df = _load_df(file_bytes, df_key, uploaded_file.name)
             
             # Show basic statistics
             st.subheader("Data Overview")
             
             # Show special notification for TRP files
-            file_format = detect_file_format(uploaded_file)
             if file_format == 'TEMS TRP':
                 st.warning("""
                 ⚠️ This is placeholder data for the TRP file. 
@@ -347,15 +781,17 @@ else:
             with tabs[0]:  # Map View
                 st.subheader("Network Performance Map")
                 st.caption("Geographical distribution of key network metrics")
-                map_fig = plot_map_data(df)
+                has_location = 'Latitude' in df.columns and 'Longitude' in df.columns
+                map_df = _map_points(df, df_key) if has_location and len(df) > MAP_MAX_POINTS else df
+                map_fig = plot_map_data(map_df)
                 st.plotly_chart(map_fig, use_container_width=True)
             
             with tabs[1]:  # RF Analysis
                 st.subheader("RF Metrics Analysis")
                 
                 # RF Metrics Analysis
-                if "RF Metrics (RSRP, RSRQ, SINR)" in analysis_types:
-                    rf_results = analyze_rf_metrics(df, rsrp_threshold, rsrq_threshold, sinr_threshold)
+                if "RF Metrics (RSRP, RSRQ, SINR)" in atypes:
+                    rf_results = _rf_metrics(df, df_key, rsrp_threshold, rsrq_threshold, sinr_threshold)
                     
                     rf_col1, rf_col2 = st.columns(2)
                     with rf_col1:
@@ -372,9 +808,9 @@ else:
                         st.write(f"Good RF Conditions: {rf_results['good_rf_pct']:.1f}% of samples")
                 
                 # Coverage Problems Analysis
-                if "Coverage Problems" in analysis_types:
+                if "Coverage Problems" in atypes:
                     st.subheader("Coverage Problems Analysis")
-                    coverage_results = analyze_coverage_problems(df, rsrp_threshold, rsrq_threshold)
+                    coverage_results = _coverage(df, df_key, rsrp_threshold, rsrq_threshold)
                     
                     # Display results
                     st.write(f"Coverage Issues: {coverage_results['coverage_issues_pct']:.1f}% of samples")
@@ -386,9 +822,9 @@ else:
                         st.dataframe(coverage_results['problem_areas'])
                 
                 # Interference Analysis
-                if "Interference" in analysis_types:
+                if "Interference" in atypes:
                     st.subheader("Interference Analysis")
-                    interference_results = analyze_interference(df, sinr_threshold)
+                    interference_results = _interference(df, df_key, sinr_threshold)
                     
                     # Display results
                     st.write(f"Interference Issues: {interference_results['interference_issues_pct']:.1f}% of samples")
@@ -402,8 +838,8 @@ else:
             with tabs[2]:  # Handover Analysis
                 st.subheader("Handover Analysis")
                 
-                if "Handover Failures" in analysis_types:
-                    handover_results = analyze_handover_failures(df)
+                if "Handover Failures" in atypes:
+                    handover_results = _handover(df, df_key)
                     
                     # Display handover analysis
                     ho_col1, ho_col2 = st.columns(2)
@@ -426,8 +862,8 @@ else:
             with tabs[3]:  # Throughput Analysis
                 st.subheader("Throughput Analysis")
                 
-                if "Throughput Bottlenecks" in analysis_types:
-                    throughput_results = analyze_throughput_bottlenecks(df)
+                if "Throughput Bottlenecks" in atypes:
+                    throughput_results = _throughput(df, df_key)
                     
                     # Display throughput analysis
                     st.plotly_chart(plot_throughput_analysis(df, throughput_results), use_container_width=True)
@@ -454,14 +890,12 @@ else:
             with tabs[4]:  # Call Quality
                 st.subheader("Call Quality Analysis")
                 
-                call_analysis_types = [t for t in analysis_types if t in [
-                    "Call Drops", "QoS Issues", "Cell Overloading"
-                ]]
+                call_analysis_types = atypes & {"Call Drops", "QoS Issues", "Cell Overloading"}
                 
                 if len(call_analysis_types) > 0:
                     # Analyze call drops
-                    if "Call Drops" in analysis_types:
-                        call_drop_results = analyze_call_drops(df)
+                    if "Call Drops" in atypes:
+                        call_drop_results = _call_drops(df, df_key)
                         
                         # Display call drop analysis
                         cd_col1, cd_col2 = st.columns(2)
@@ -480,7 +914,7 @@ else:
                                     st.write(f"{cause}: {count} occurrences")
                     
                     # Analyze QoS issues
-                    if "QoS Issues" in analysis_types:
+                    if "QoS Issues" in atypes:
                         qos_results = analyze_qos_issues(df)
                         
                         st.subheader("QoS Analysis")
@@ -491,7 +925,7 @@ else:
                         st.write(f"Data Bearer QCI Issues: {qos_results['qci_issues_pct']:.2f}% of sessions")
                     
                     # Analyze cell overloading
-                    if "Cell Overloading" in analysis_types:
+                    if "Cell Overloading" in atypes:
                         overloading_results = analyze_cell_overloading(df)
                         
                         st.subheader("Cell Overloading Analysis")
@@ -512,58 +946,8 @@ else:
                 # Root cause summary
                 st.subheader("Root Cause Analysis Summary")
                 
-                root_causes = []
-                
-                # Add root causes based on selected analysis types
-                if "Coverage Problems" in analysis_types:
-                    coverage_results = analyze_coverage_problems(df, rsrp_threshold, rsrq_threshold)
-                    if coverage_results['coverage_issues_pct'] > 10:
-                        root_causes.append({
-                            "Issue": "Coverage Problems",
-                            "Severity": "High" if coverage_results['coverage_issues_pct'] > 25 else "Medium",
-                            "Description": f"Poor signal coverage affecting {coverage_results['coverage_issues_pct']:.1f}% of the drive test area",
-                            "Recommendation": "Review cell site placement and antenna configurations. Consider adding new sites in critical areas."
-                        })
-                
-                if "Interference" in analysis_types:
-                    interference_results = analyze_interference(df, sinr_threshold)
-                    if interference_results['interference_issues_pct'] > 10:
-                        root_causes.append({
-                            "Issue": "Interference Issues",
-                            "Severity": "High" if interference_results['interference_issues_pct'] > 25 else "Medium",
-                            "Description": f"High interference affecting {interference_results['interference_issues_pct']:.1f}% of the drive test area",
-                            "Recommendation": "Review PCI planning, adjust antenna tilts, and optimize frequency planning to reduce interference."
-                        })
-                
-                if "Handover Failures" in analysis_types:
-                    handover_results = analyze_handover_failures(df)
-                    if handover_results['handover_success_rate'] < 95:
-                        root_causes.append({
-                            "Issue": "Handover Failures",
-                            "Severity": "High" if handover_results['handover_success_rate'] < 90 else "Medium",
-                            "Description": f"Handover failures with success rate of {handover_results['handover_success_rate']:.2f}%",
-                            "Recommendation": "Review neighbor cell lists, optimize handover parameters, and check for missing neighbors."
-                        })
-                
-                if "Throughput Bottlenecks" in analysis_types:
-                    throughput_results = analyze_throughput_bottlenecks(df)
-                    if throughput_results['dl_bottleneck_areas'] > 5 or throughput_results['ul_bottleneck_areas'] > 5:
-                        root_causes.append({
-                            "Issue": "Throughput Bottlenecks",
-                            "Severity": "Medium",
-                            "Description": f"Low throughput areas identified: {throughput_results['dl_bottleneck_areas']} DL and {throughput_results['ul_bottleneck_areas']} UL locations",
-                            "Recommendation": "Check resource allocation, scheduling algorithms, and consider capacity expansions in affected cells."
-                        })
-                
-                if "Call Drops" in analysis_types:
-                    call_drop_results = analyze_call_drops(df)
-                    if call_drop_results['call_drop_rate'] > 2:
-                        root_causes.append({
-                            "Issue": "Call Drops",
-                            "Severity": "High" if call_drop_results['call_drop_rate'] > 5 else "Medium",
-                            "Description": f"Call drop rate of {call_drop_results['call_drop_rate']:.2f}%",
-                            "Recommendation": "Review RRC configuration, mobility parameters, and cell coverage overlaps to reduce drops."
-                        })
+                summary_args = (df, df_key, tuple(sorted(atypes)), rsrp_threshold, rsrq_threshold, sinr_threshold)
+                root_causes = _summary_root_causes(*summary_args)
                 
                 if root_causes:
                     st.dataframe(pd.DataFrame(root_causes))
@@ -573,7 +957,7 @@ else:
                 # Export report option
                 st.download_button(
                     label="Download Summary Report",
-                    data=pd.DataFrame(root_causes).to_csv(index=False) if root_causes else "No significant issues detected",
+                    data=_build_report_bytes(*summary_args),
                     file_name="lte_drive_test_analysis_report.csv",
                     mime="text/csv"
                 )
@@ -589,195 +973,56 @@ else:
                     if database_available and st.button("Save Current Drive Test to Database"):
                         # Save the current drive test data
                         try:
-                            drive_test = save_drive_test(
-                                filename=uploaded_file.name,
-                                file_format=file_format,
-                                df=df
-                            )
+                            reports = []
+                            problem_areas = []
                             
                             # Also save any analysis that was done
-                            if "RF Metrics (RSRP, RSRQ, SINR)" in analysis_types:
-                                rf_results = analyze_rf_metrics(df, rsrp_threshold, rsrq_threshold, sinr_threshold)
+                            if "RF Metrics (RSRP, RSRQ, SINR)" in atypes:
+                                rf_results = _rf_metrics(df, df_key, rsrp_threshold, rsrq_threshold, sinr_threshold)
                                 thresholds = {
                                     "rsrp_threshold": rsrp_threshold,
                                     "rsrq_threshold": rsrq_threshold,
                                     "sinr_threshold": sinr_threshold
                                 }
-                                save_analysis_report(
-                                    drive_test_id=drive_test.id,
-                                    analysis_type="RF Metrics",
-                                    thresholds=thresholds,
-                                    results=rf_results
-                                )
+                                if _has_results(rf_results):
+                                    reports.append(("RF Metrics", thresholds, rf_results))
                             
                             # Save coverage analysis
-                            if "Coverage Problems" in analysis_types:
-                                coverage_results = analyze_coverage_problems(df, rsrp_threshold, rsrq_threshold)
+                            if "Coverage Problems" in atypes:
+                                coverage_results = _coverage(df, df_key, rsrp_threshold, rsrq_threshold)
                                 thresholds = {
                                     "rsrp_threshold": rsrp_threshold,
                                     "rsrq_threshold": rsrq_threshold
                                 }
-                                save_analysis_report(
-                                    drive_test_id=drive_test.id,
-                                    analysis_type="Coverage Problems",
-                                    thresholds=thresholds,
-                                    results=coverage_results
-                                )
+                                if _has_results(coverage_results):
+                                    reports.append(("Coverage Problems", thresholds, coverage_results))
                                 
                                 # Save problem areas
-                                if len(coverage_results['problem_areas']) > 0:
-                                    save_problem_areas(
-                                        drive_test_id=drive_test.id,
-                                        problem_type="Coverage",
-                                        problem_areas_df=coverage_results['problem_areas']
-                                    )
+                                if not coverage_results['problem_areas'].empty:
+                                    problem_areas.append(("Coverage", coverage_results['problem_areas']))
                             
-                            st.success(f"Drive test '{uploaded_file.name}' saved to database successfully (ID: {drive_test.id})!")
+                            # The storage worker writes the drive test, its reports and problem
+                            # areas in one transaction while the page keeps responding
+                            job_id = enqueue_save(SaveJob(
+                                filename=uploaded_file.name,
+                                file_format=file_format,
+                                df=df,
+                                reports=tuple(reports),
+                                problem_areas=tuple(problem_areas)
+                            ))
+                            st.session_state.setdefault("save_jobs", []).append((job_id, uploaded_file.name))
                             
                         except Exception as e:
                             st.error(f"Error saving to database: {str(e)}")
-                
-                # List all drive tests in the database
-                st.subheader("Saved Drive Tests")
-                
-                try:
-                    drive_tests = get_all_drive_tests()
                     
-                    if not drive_tests:
-                        st.info("No drive tests saved in the database yet.")
+                    # Report the outcome of saves queued in this session, polling
+                    # while any of them is still waiting on the storage worker
+                    if _has_pending_saves():
+                        _poll_save_jobs()
                     else:
-                        # Convert to dataframe for display
-                        drive_tests_data = []
-                        for dt in drive_tests:
-                            drive_tests_data.append({
-                                "ID": dt.id,
-                                "Filename": dt.filename,
-                                "Format": dt.file_format,
-                                "Upload Date": dt.upload_date.strftime("%Y-%m-%d %H:%M"),
-                                "Records": dt.record_count,
-                                "Start Time": dt.start_time.strftime("%Y-%m-%d %H:%M") if dt.start_time else "N/A",
-                                "End Time": dt.end_time.strftime("%Y-%m-%d %H:%M") if dt.end_time else "N/A"
-                            })
-                        
-                        # Display as dataframe
-                        st.dataframe(pd.DataFrame(drive_tests_data))
-                        
-                        # Select drive test for details
-                        selected_id = st.selectbox(
-                            "Select Drive Test to View Details",
-                            options=[dt["ID"] for dt in drive_tests_data],
-                            format_func=lambda x: f"ID: {x} - {next((dt['Filename'] for dt in drive_tests_data if dt['ID'] == x), 'Unknown')}"
-                        )
-                        
-                        if selected_id:
-                            # Get the selected drive test details
-                            drive_test = get_drive_test_by_id(selected_id)
-                            
-                            if drive_test:
-                                st.subheader(f"Drive Test Details: {drive_test.filename}")
-                                
-                                # Display basic info
-                                detail_col1, detail_col2 = st.columns(2)
-                                with detail_col1:
-                                    st.write(f"**ID:** {drive_test.id}")
-                                    st.write(f"**Filename:** {drive_test.filename}")
-                                    st.write(f"**Format:** {drive_test.file_format}")
-                                
-                                with detail_col2:
-                                    st.write(f"**Upload Date:** {drive_test.upload_date.strftime('%Y-%m-%d %H:%M')}")
-                                    st.write(f"**Record Count:** {drive_test.record_count}")
-                                    st.write(f"**Time Range:** {drive_test.start_time.strftime('%Y-%m-%d %H:%M') if drive_test.start_time else 'N/A'} to {drive_test.end_time.strftime('%Y-%m-%d %H:%M') if drive_test.end_time else 'N/A'}")
-                                
-                                # Show metrics if available
-                                if drive_test.metrics:
-                                    st.subheader("Test Metrics")
-                                    metrics = drive_test.metrics[0]  # Get the first (should be only) metrics object
-                                    
-                                    metric_col1, metric_col2, metric_col3, metric_col4 = st.columns(4)
-                                    with metric_col1:
-                                        if metrics.avg_rsrp is not None:
-                                            st.metric("Avg RSRP (dBm)", f"{metrics.avg_rsrp:.2f}")
-                                    with metric_col2:
-                                        if metrics.avg_rsrq is not None:
-                                            st.metric("Avg RSRQ (dB)", f"{metrics.avg_rsrq:.2f}")
-                                    with metric_col3:
-                                        if metrics.avg_sinr is not None:
-                                            st.metric("Avg SINR (dB)", f"{metrics.avg_sinr:.2f}")
-                                    with metric_col4:
-                                        if metrics.avg_throughput_dl is not None:
-                                            st.metric("Avg DL Throughput (Mbps)", f"{metrics.avg_throughput_dl/1000:.2f}")
-                                
-                                # Show analysis reports if available
-                                reports = get_reports_for_drive_test(drive_test.id)
-                                if reports:
-                                    st.subheader("Analysis Reports")
-                                    
-                                    for report in reports:
-                                        with st.expander(f"{report.analysis_type} - {report.report_date.strftime('%Y-%m-%d %H:%M')}"):
-                                            st.write(f"**Analysis Type:** {report.analysis_type}")
-                                            st.write(f"**Report Date:** {report.report_date.strftime('%Y-%m-%d %H:%M')}")
-                                            
-                                            # Display thresholds
-                                            if report.threshold_values:
-                                                st.write("**Thresholds:**")
-                                                thresholds = json.loads(report.threshold_values)
-                                                for key, value in thresholds.items():
-                                                    st.write(f"- {key}: {value}")
-                                            
-                                            # Display results
-                                            if report.results:
-                                                st.write("**Results:**")
-                                                results = json.loads(report.results)
-                                                for key, value in results.items():
-                                                    if not isinstance(value, dict) and not isinstance(value, list):
-                                                        st.write(f"- {key}: {value}")
-                                            
-                                            # Display root causes if available
-                                            if report.root_causes:
-                                                st.write("**Root Causes:**")
-                                                for rc in report.root_causes:
-                                                    st.write(f"- **{rc.issue_type}** ({rc.severity}): {rc.description}")
-                                                    st.write(f"  Recommendation: {rc.recommendation}")
-                                
-                                # Show problem areas if available
-                                problem_areas = get_problem_areas_for_drive_test(drive_test.id)
-                                if problem_areas:
-                                    st.subheader("Problem Areas")
-                                    
-                                    # Group by problem type
-                                    problem_types = {}
-                                    for pa in problem_areas:
-                                        if pa.problem_type not in problem_types:
-                                            problem_types[pa.problem_type] = []
-                                        problem_types[pa.problem_type].append(pa)
-                                    
-                                    for problem_type, areas in problem_types.items():
-                                        with st.expander(f"{problem_type} Problems ({len(areas)} areas)"):
-                                            areas_data = []
-                                            for area in areas:
-                                                areas_data.append({
-                                                    "ID": area.id,
-                                                    "Latitude": area.latitude,
-                                                    "Longitude": area.longitude,
-                                                    "RSRP (dBm)": area.avg_rsrp,
-                                                    "RSRQ (dB)": area.avg_rsrq,
-                                                    "SINR (dB)": area.avg_sinr,
-                                                    "Cell ID": area.cell_id,
-                                                    "Description": area.description
-                                                })
-                                            st.dataframe(pd.DataFrame(areas_data))
-                                
-                                # Option to delete the drive test
-                                if st.button(f"Delete Drive Test ID: {drive_test.id}"):
-                                    if delete_drive_test(drive_test.id):
-                                        st.success(f"Drive test '{drive_test.filename}' (ID: {drive_test.id}) deleted successfully!")
-                                        st.warning("Refresh the page to update the list.")
-                                    else:
-                                        st.error(f"Error deleting drive test ID: {drive_test.id}")
+                        _report_save_jobs()
                 
-                except Exception as e:
-                    st.error(f"Error accessing database: {str(e)}")
-                    st.exception(e)
+                render_saved_drive_tests()
     
     except Exception as e:
         st.error(f"Error processing the data: {str(e)}")
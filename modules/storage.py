@@ -0,0 +1,382 @@
+import io
+import json
+import queue
+import logging
+import itertools
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+from sqlalchemy import insert
+from modules.database import get_session, DriveTest, TestMetrics, AnalysisReport, ProblemArea
+
+logger = logging.getLogger(__name__)
+
+# Problem area DataFrame columns and the ProblemArea fields they populate
+PROBLEM_AREA_COLUMNS = {
+    'Latitude': 'latitude',
+    'Longitude': 'longitude',
+    'Start_Time': 'start_time',
+    'End_Time': 'end_time',
+    'Avg_RSRP': 'avg_rsrp',
+    'Avg_RSRQ': 'avg_rsrq',
+    'Avg_SINR': 'avg_sinr',
+    'Main_Cell_ID': 'cell_id'
+}
+
+# Rows per multi-row INSERT statement when bulk writing through insertmanyvalues
+INSERT_PAGE_SIZE = 10000
+
+# Creates the sessions used by this module; get_session builds a new engine per
+# call, so the app swaps in a sessionmaker bound to its shared engine
+_session_factory = get_session
+
+def configure_sessions(factory):
+    """
+    Create storage sessions with factory instead of database.get_session
+
+    Args:
+        factory: Callable returning a new Session, e.g. a sessionmaker bound
+            to a shared engine
+    """
+    global _session_factory
+    _session_factory = factory
+
+@contextmanager
+def session_scope():
+    """Provide a database session for a block of work, closing it when the block exits"""
+    session = _session_factory()
+    try:
+        yield session
+    finally:
+        session.close()
+
+def _json_default(value):
+    """Serialize the pandas/NumPy values found in analysis results"""
+    if isinstance(value, pd.DataFrame):
+        return value.to_dict(orient='records')
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+def _report_results(results):
+    """
+    Drop tabular values from analysis results before they are stored as JSON
+
+    Tables such as the coverage problem areas are persisted as rows in their
+    own table, so repeating them in the results text only bloats the report.
+    """
+    return {key: value for key, value in results.items() if not isinstance(value, pd.DataFrame)}
+
+def _column_mean(df, column):
+    """Mean of a column as a plain float, or None if the column is missing"""
+    return float(df[column].mean()) if column in df.columns else None
+
+def _problem_area_rows(drive_test_id, problem_type, problem_areas_df):
+    """
+    Convert a problem areas DataFrame into ProblemArea insert parameters
+
+    Args:
+        drive_test_id: ID of the drive test
+        problem_type: Type of problem (Coverage, Interference, etc.)
+        problem_areas_df: DataFrame with problem areas data
+
+    Returns:
+        List of dictionaries keyed by ProblemArea column names
+    """
+    rows_df = problem_areas_df.reindex(columns=list(PROBLEM_AREA_COLUMNS)).rename(columns=PROBLEM_AREA_COLUMNS)
+    area_ids = problem_areas_df['Area_ID'] if 'Area_ID' in problem_areas_df.columns else range(1, len(problem_areas_df) + 1)
+    rows_df['description'] = [f"Problem area {area_id}" for area_id in area_ids]
+    rows_df['drive_test_id'] = drive_test_id
+    rows_df['problem_type'] = problem_type
+    # Missing values become None so every insert path stores NULL, not NaN
+    rows_df = rows_df.astype(object).where(rows_df.notna(), None)
+    return rows_df.to_dict(orient='records')
+
+def _copy_rows(session, table, rows):
+    """
+    Stream rows into a PostgreSQL table with psycopg2's COPY on the session's connection
+
+    COPY runs on the same DBAPI connection as the surrounding transaction, so
+    the rows commit or roll back together with the rest of the job.
+    """
+    columns = list(rows[0])
+    buffer = io.StringIO()
+    pd.DataFrame.from_records(rows, columns=columns).to_csv(buffer, index=False, header=False)
+    buffer.seek(0)
+
+    cursor = session.connection().connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH CSV", buffer)
+    finally:
+        cursor.close()
+
+def _bulk_insert(session, model, rows):
+    """Insert rows with COPY through psycopg2, otherwise as paged executemany"""
+    dialect = session.get_bind().dialect
+    if dialect.name == 'postgresql' and dialect.driver == 'psycopg2':
+        _copy_rows(session, model.__table__, rows)
+    else:
+        session.execute(insert(model).execution_options(insertmanyvalues_page_size=INSERT_PAGE_SIZE), rows)
+
+@dataclass(frozen=True)
+class DriveTestInfo:
+    """
+    Plain copy of a drive_tests row, safe to cache and keep across reruns
+
+    Attributes:
+        id: ID of the drive test
+        filename: Name of the uploaded file
+        file_format: Format of the file (CSV, Excel, etc.)
+        upload_date: When the drive test was saved
+        record_count: Number of records in the file
+        start_time: First timestamp in the data, or None
+        end_time: Last timestamp in the data, or None
+    """
+    id: int
+    filename: str
+    file_format: str
+    upload_date: object
+    record_count: int
+    start_time: object
+    end_time: object
+
+@dataclass(frozen=True)
+class SaveJob:
+    """
+    A drive test save, queued for the storage worker
+
+    Attributes:
+        filename: Name of the uploaded file
+        file_format: Format of the file (CSV, Excel, etc.)
+        df: DataFrame with the processed data
+        reports: Sequence of (analysis_type, thresholds, results) tuples
+        problem_areas: Sequence of (problem_type, problem_areas_df) tuples
+    """
+    filename: str
+    file_format: str
+    df: pd.DataFrame
+    reports: tuple = ()
+    problem_areas: tuple = ()
+
+def _write_job(session, job):
+    """
+    Add a drive test with its metrics, reports and problem areas to an open
+    transaction
+
+    Args:
+        session: Session with an active transaction
+        job: SaveJob to write
+
+    Returns:
+        ID of the created drive test
+    """
+    df = job.df
+    drive_test = DriveTest(
+        filename=job.filename,
+        file_format=job.file_format,
+        record_count=len(df),
+        start_time=df['Timestamp'].min() if 'Timestamp' in df.columns else None,
+        end_time=df['Timestamp'].max() if 'Timestamp' in df.columns else None
+    )
+    session.add(drive_test)
+    session.flush()  # Flush to get the ID for the dependent rows
+    drive_test_id = drive_test.id
+
+    session.add(TestMetrics(
+        drive_test_id=drive_test_id,
+        avg_rsrp=_column_mean(df, 'RSRP'),
+        avg_rsrq=_column_mean(df, 'RSRQ'),
+        avg_sinr=_column_mean(df, 'SINR'),
+        avg_throughput_dl=_column_mean(df, 'Throughput_DL'),
+        avg_throughput_ul=_column_mean(df, 'Throughput_UL')
+    ))
+
+    # One executemany INSERT per table instead of a round-trip per row
+    if job.reports:
+        session.execute(insert(AnalysisReport), [
+            {
+                'drive_test_id': drive_test_id,
+                'analysis_type': analysis_type,
+                'threshold_values': json.dumps(thresholds),
+                'results': json.dumps(_report_results(results), default=_json_default)
+            }
+            for analysis_type, thresholds, results in job.reports
+        ])
+
+    area_rows = [
+        row
+        for problem_type, problem_areas_df in job.problem_areas
+        for row in _problem_area_rows(drive_test_id, problem_type, problem_areas_df)
+    ]
+    if area_rows:
+        _bulk_insert(session, ProblemArea, area_rows)
+
+    return drive_test_id
+
+def delete_drive_test(drive_test_id):
+    """
+    Delete a drive test and all related data
+
+    Args:
+        drive_test_id: ID of the drive test
+
+    Returns:
+        True if successful, False otherwise
+    """
+    try:
+        with session_scope() as session, session.begin():
+            drive_test = session.get(DriveTest, drive_test_id)
+            if drive_test is None:
+                return False
+            session.delete(drive_test)
+        return True
+    except Exception:
+        logger.exception("Deleting drive test %s failed", drive_test_id)
+        return False
+
+def save_drive_test_bundle(filename, file_format, df, reports=(), problem_areas=()):
+    """
+    Save a drive test with its metrics, analysis reports and problem areas
+    in a single transaction
+
+    Args:
+        filename: Name of the uploaded file
+        file_format: Format of the file (CSV, Excel, etc.)
+        df: DataFrame with the processed data
+        reports: Sequence of (analysis_type, thresholds, results) tuples
+        problem_areas: Sequence of (problem_type, problem_areas_df) tuples
+
+    Returns:
+        ID of the created drive test
+    """
+    with session_scope() as session, session.begin():
+        return _write_job(session, SaveJob(filename, file_format, df, tuple(reports), tuple(problem_areas)))
+
+# Background writer: saves are queued by the UI and committed by a daemon
+# thread, so the Streamlit script returns without waiting on the database
+MAX_JOBS_PER_BATCH = 8
+# Finished saves whose outcome is kept for get_save_status; older ones are evicted
+MAX_FINISHED_STATUSES = 256
+
+_write_queue = queue.SimpleQueue()
+_job_ids = itertools.count(1)
+_save_status = {}
+_finished_jobs = OrderedDict()
+_status_lock = threading.Lock()
+_worker_lock = threading.Lock()
+_worker = None
+
+class StorageWorker(threading.Thread):
+    """Daemon thread that drains queued save jobs and writes them in batches"""
+
+    def __init__(self, jobs):
+        super().__init__(name="StorageWorker", daemon=True)
+        self.jobs = jobs
+
+    def run(self):
+        while True:
+            batch = [self.jobs.get()]
+            while len(batch) < MAX_JOBS_PER_BATCH:
+                try:
+                    batch.append(self.jobs.get_nowait())
+                except queue.Empty:
+                    break
+
+            flushes = [item for item in batch if isinstance(item, threading.Event)]
+            jobs = [item for item in batch if not isinstance(item, threading.Event)]
+            if jobs:
+                self._write_batch(jobs)
+            for flushed in flushes:
+                flushed.set()
+
+    def _write_batch(self, jobs):
+        """Write a batch in one transaction, falling back to one transaction per job"""
+        try:
+            with session_scope() as session, session.begin():
+                saved = [(job_id, _write_job(session, job)) for job_id, job in jobs]
+        except Exception as e:
+            if len(jobs) == 1:
+                logger.exception("Background save of %s failed", jobs[0][1].filename)
+                _finish_job(jobs[0][0], "failed", str(e))
+                return
+            saved = None
+
+        if saved is not None:
+            for job_id, drive_test_id in saved:
+                _finish_job(job_id, "saved", drive_test_id)
+            return
+
+        # Retry separately so one bad job does not lose the rest of the batch
+        for job_id, job in jobs:
+            try:
+                drive_test_id = save_drive_test_bundle(
+                    job.filename, job.file_format, job.df, job.reports, job.problem_areas
+                )
+                _finish_job(job_id, "saved", drive_test_id)
+            except Exception as e:
+                logger.exception("Background save of %s failed", job.filename)
+                _finish_job(job_id, "failed", str(e))
+
+def _finish_job(job_id, state, detail):
+    """Record a finished save, evicting the oldest outcomes past MAX_FINISHED_STATUSES"""
+    with _status_lock:
+        _save_status[job_id] = (state, detail)
+        _finished_jobs[job_id] = None
+        while len(_finished_jobs) > MAX_FINISHED_STATUSES:
+            evicted, _ = _finished_jobs.popitem(last=False)
+            _save_status.pop(evicted, None)
+
+def _ensure_worker():
+    """Start the storage worker thread if it is not running yet"""
+    global _worker
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = StorageWorker(_write_queue)
+            _worker.start()
+
+def enqueue_save(job):
+    """
+    Queue a drive test save for the background storage worker
+
+    Args:
+        job: SaveJob to write
+
+    Returns:
+        Job ID to pass to get_save_status
+    """
+    _ensure_worker()
+    job_id = next(_job_ids)
+    with _status_lock:
+        _save_status[job_id] = ("queued", None)
+    _write_queue.put((job_id, job))
+    return job_id
+
+def get_save_status(job_id):
+    """
+    Get the state of a queued save
+
+    Args:
+        job_id: ID returned by enqueue_save
+
+    Returns:
+        Tuple of ("queued" | "saved" | "failed", drive test ID or error message),
+        or ("unknown", None) once the outcome has been evicted
+    """
+    return _save_status.get(job_id, ("unknown", None))
+
+def flush(timeout=None):
+    """
+    Block until every save queued before this call has been written
+
+    Intended for tests and shutdown, where determinism matters more than latency.
+
+    Returns:
+        True if the queue drained within the timeout
+    """
+    _ensure_worker()
+    flushed = threading.Event()
+    _write_queue.put(flushed)
+    return flushed.wait(timeout)
@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from modules import storage
+from modules.database import Base, DriveTest, ProblemArea
+
+@pytest.fixture
+def sessions(tmp_path, monkeypatch):
+    """Point the storage module at a fresh SQLite database"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'storage.db'}")
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(storage, "_session_factory", factory)
+    yield factory
+    assert storage.flush(timeout=10)
+    engine.dispose()
+
+def _drive_test_df(timestamps=None):
+    return pd.DataFrame({
+        'Timestamp': pd.date_range('2024-01-01', periods=3, freq='s') if timestamps is None else timestamps,
+        'RSRP': np.array([-100, -110, -95], dtype=np.float32),
+        'SINR': np.array([5, 2, 8], dtype=np.float32)
+    })
+
+def _problem_areas_df():
+    return pd.DataFrame({
+        'Area_ID': [1, 2],
+        'Latitude': [1.0, np.nan],
+        'Longitude': [3.0, 4.0],
+        'Start_Time': pd.to_datetime(['2024-01-01', None]),
+        'Avg_RSRP': np.array([-110, np.nan], dtype=np.float32),
+        'Main_Cell_ID': ['A', None]
+    })
+
+def test_mixed_batch_saves_good_jobs_and_fails_bad_ones(sessions):
+    good = storage.SaveJob('good.csv', 'CSV', _drive_test_df(), problem_areas=(('Coverage', _problem_areas_df()),))
+    # SQLite rejects strings in DateTime columns, so this job fails to write
+    bad = storage.SaveJob('bad.csv', 'CSV', _drive_test_df(timestamps=['not a date'] * 3))
+
+    # Write both in one batch directly; through the queue the worker may pick
+    # up the first job before the second is enqueued
+    good_id, bad_id = next(storage._job_ids), next(storage._job_ids)
+    storage.StorageWorker(storage._write_queue)._write_batch([(good_id, good), (bad_id, bad)])
+
+    state, drive_test_id = storage.get_save_status(good_id)
+    assert state == "saved"
+    state, error = storage.get_save_status(bad_id)
+    assert state == "failed"
+    assert error
+
+    session = sessions()
+    try:
+        assert [row.filename for row in session.query(DriveTest.filename)] == ['good.csv']
+        assert session.query(ProblemArea).filter(ProblemArea.drive_test_id == drive_test_id).count() == 2
+    finally:
+        session.close()
+
+def test_queued_saves_are_written_by_the_worker(sessions):
+    job_id = storage.enqueue_save(storage.SaveJob('queued.csv', 'CSV', _drive_test_df()))
+    assert storage.flush(timeout=10)
+
+    state, drive_test_id = storage.get_save_status(job_id)
+    assert state == "saved"
+    session = sessions()
+    try:
+        assert session.get(DriveTest, drive_test_id).record_count == 3
+    finally:
+        session.close()
+
+def test_finished_statuses_are_evicted_past_the_cap(sessions, monkeypatch):
+    monkeypatch.setattr(storage, "MAX_FINISHED_STATUSES", 2)
+
+    job_ids = [storage.enqueue_save(storage.SaveJob(f"{i}.csv", 'CSV', _drive_test_df())) for i in range(3)]
+    assert storage.flush(timeout=10)
+
+    assert storage.get_save_status(job_ids[0]) == ("unknown", None)
+    assert [storage.get_save_status(job_id)[0] for job_id in job_ids[1:]] == ["saved", "saved"]
+
+def test_problem_area_rows_store_missing_values_as_none():
+    rows = storage._problem_area_rows(7, 'Coverage', _problem_areas_df())
+
+    assert rows[0]['latitude'] == 1.0
+    assert rows[0]['avg_rsrp'] == -110.0 and type(rows[0]['avg_rsrp']) is float
+    assert rows[1]['latitude'] is None
+    assert rows[1]['start_time'] is None
+    assert rows[1]['avg_rsrp'] is None
+    assert rows[1]['cell_id'] is None
+    # Columns absent from the DataFrame are stored as NULL too
+    assert rows[0]['avg_sinr'] is None
+    assert rows[1]['description'] == "Problem area 2"
+    assert rows[1]['drive_test_id'] == 7